@@ -47,3 +47,19 @@ create index if not exists idx_clips_video_id on public.clips(video_id);
 create index if not exists idx_tags_facet_name on public.tags(facet, name);
 create index if not exists idx_clip_tags_tag_id on public.clip_tags(tag_id);
 create index if not exists idx_video_tags_tag_id on public.video_tags(tag_id);
+
+-- Tags for many clips in one call (POST /rest/v1/rpc/get_tags_for_clips).
+-- Used by supabase_store.get_tags_for_clips for ingest/external callers; the web API
+-- reads tags through embedded selects and does not need it. Optional: callers fall back
+-- to two plain queries if it is missing.
+create or replace function public.get_tags_for_clips(clip_ids bigint[])
+returns table (clip_id bigint, id bigint, facet text, name text)
+language sql
+stable
+as $$
+  select ct.clip_id, t.id, t.facet, t.name
+  from public.clip_tags ct
+  join public.tags t on t.id = ct.tag_id
+  where ct.clip_id = any(clip_ids)
+  order by ct.clip_id, t.facet, t.name;
+$$;
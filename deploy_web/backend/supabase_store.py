@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import functools
 import mimetypes
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Callable
 from urllib.parse import quote
 
+import httpx
+import orjson
 import requests
+from cachetools import LRUCache, TTLCache
+from requests.adapters import HTTPAdapter
 from tusclient import client as tus_client
+from tusclient.exceptions import TusCommunicationError
+from urllib3.util.retry import Retry
 
 from dotenv import load_dotenv
 
@@ -22,15 +34,100 @@ SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
 if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
     raise RuntimeError("Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY in environment.")
 
+# Supabase documents 6 MiB chunks for resumable uploads; 2 MiB is the fallback if a size is rejected.
+TUS_CHUNK_SIZE = int(os.getenv("TUS_CHUNK_SIZE", str(6 * 1024 * 1024)))
+TUS_FALLBACK_CHUNK_SIZE = 2 * 1024 * 1024
+
+# Files above this size are uploaded as concurrent tus partial uploads.
+TUS_PARALLEL_THRESHOLD = 256 * 1024 * 1024
+
+# Auth headers are fixed for the process; build them once.
+_BASE_HEADERS = {
+    "apikey": SUPABASE_SERVICE_ROLE_KEY,
+    "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
+}
+
+# Transient-error retry policy shared by the sync session and the async client.
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF_SEC = 0.2
+_RETRY_STATUSES = (429, 502, 503, 504)
+_RETRY_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+# Shared keep-alive session so REST/Storage calls reuse pooled TLS connections.
+_SESSION = requests.Session()
+_SESSION.headers.update(_BASE_HEADERS)
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=_RETRY_TOTAL,
+            backoff_factor=_RETRY_BACKOFF_SEC,
+            status_forcelist=_RETRY_STATUSES,
+            raise_on_status=False,
+        ),
+    ),
+)
+
+# Tag vocabulary changes rarely; keep it in process memory for a short TTL.
+_TAGS_CACHE: TTLCache = TTLCache(maxsize=16, ttl=60)
+_TAGS_CACHE_LOCK = threading.Lock()
+
+
+def _cached(key: Any, fn: Callable[[], Any]) -> Any:
+    with _TAGS_CACHE_LOCK:
+        if key in _TAGS_CACHE:
+            return _TAGS_CACHE[key]
+    value = fn()
+    with _TAGS_CACHE_LOCK:
+        _TAGS_CACHE[key] = value
+    return value
+
+
+def _invalidate_tags_cache() -> None:
+    with _TAGS_CACHE_LOCK:
+        _TAGS_CACHE.clear()
+
+
+# Signed URLs keyed by (uri, expires_in) -> (reuse-until epoch, url). A cached URL is only
+# reused while at least half its lifetime remains, since lazy images load late.
+_SIGNED_URL_CACHE: LRUCache = LRUCache(maxsize=4096)
+_SIGNED_URL_CACHE_LOCK = threading.Lock()
+
 
 def _api_headers(extra: dict[str, str] | None = None) -> dict[str, str]:
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-    }
-    if extra:
-        headers.update(extra)
-    return headers
+    # Without extras this is the shared base dict; callers must not mutate it.
+    return _BASE_HEADERS if not extra else {**_BASE_HEADERS, **extra}
+
+
+# Async client for the API routes, created on first use so sync importers never build it.
+_aclient: httpx.AsyncClient | None = None
+
+
+def _get_aclient() -> httpx.AsyncClient:
+    global _aclient
+    if _aclient is None:
+        # HTTP/2 multiplexes concurrent calls over one connection. The transport retries
+        # connect errors; _arequest retries transient statuses.
+        _aclient = httpx.AsyncClient(
+            base_url=SUPABASE_URL,
+            headers=_api_headers(),
+            timeout=120,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=_RETRY_TOTAL,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            ),
+        )
+    return _aclient
+
+
+async def aclose() -> None:
+    global _aclient
+    if _aclient is not None:
+        client, _aclient = _aclient, None
+        await client.aclose()
 
 
 def _request(
@@ -39,27 +136,69 @@ def _request(
     *,
     params: dict[str, Any] | None = None,
     json_body: Any | None = None,
-    data: bytes | None = None,
+    data: bytes | BinaryIO | None = None,
     headers: dict[str, str] | None = None,
     ok_codes: tuple[int, ...] = (200, 201, 204),
 ) -> Any:
     url = f"{SUPABASE_URL}{path}"
-    merged_headers = _api_headers(headers)
-    response = requests.request(
+    # Auth headers live on the session; only per-call extras are sent here.
+    extra_headers = dict(headers or {})
+    if json_body is not None:
+        data = orjson.dumps(json_body)
+        extra_headers["Content-Type"] = "application/json"
+    response = _SESSION.request(
         method=method,
         url=url,
         params=params,
-        json=json_body,
         data=data,
-        headers=merged_headers,
+        headers=extra_headers,
         timeout=120,
     )
+    return _parse_response(method, path, response, ok_codes)
+
+
+async def _arequest(
+    method: str,
+    path: str,
+    *,
+    params: dict[str, Any] | None = None,
+    json_body: Any | None = None,
+    headers: dict[str, str] | None = None,
+    ok_codes: tuple[int, ...] = (200, 201, 204),
+) -> Any:
+    extra_headers = dict(headers or {})
+    content: bytes | None = None
+    if json_body is not None:
+        content = orjson.dumps(json_body)
+        extra_headers["Content-Type"] = "application/json"
+    # Mirror the sync session: only idempotent methods are retried on transient statuses.
+    attempts = _RETRY_TOTAL + 1 if method.upper() in _RETRY_METHODS else 1
+    for attempt in range(attempts):
+        response = await _get_aclient().request(
+            method,
+            path,
+            params=params,
+            content=content,
+            headers=extra_headers,
+        )
+        if response.status_code not in _RETRY_STATUSES or attempt == attempts - 1:
+            break
+        await asyncio.sleep(_RETRY_BACKOFF_SEC * (2**attempt))
+    return _parse_response(method, path, response, ok_codes)
+
+
+def _parse_response(
+    method: str,
+    path: str,
+    response: requests.Response | httpx.Response,
+    ok_codes: tuple[int, ...],
+) -> Any:
     if response.status_code not in ok_codes:
         raise RuntimeError(
             f"Supabase request failed: {method} {path} [{response.status_code}] {response.text}"
         )
     if response.content:
-        return response.json()
+        return orjson.loads(response.content)
     return None
 
 
@@ -82,6 +221,12 @@ def parse_storage_uri(uri: str) -> tuple[str, str]:
 
 
 def ensure_bucket(bucket: str, public: bool = False) -> None:
+    _ensure_bucket_cached(bucket, public)
+
+
+# Buckets are checked at most once per process; failures raise and are not cached, so they retry.
+@functools.lru_cache(maxsize=32)
+def _ensure_bucket_cached(bucket: str, public: bool) -> None:
     existing = _request("GET", "/storage/v1/bucket", ok_codes=(200,))
     if any(item.get("id") == bucket for item in existing):
         return
@@ -124,22 +269,25 @@ def upload_file(bucket: str, object_path: str, local_path: str, upsert: bool = T
     content_type = mimetypes.guess_type(source.name)[0] or "application/octet-stream"
     file_size = source.stat().st_size
     # Supabase simple object upload is best for small files; use TUS for larger objects.
-    if file_size >= 45 * 1024 * 1024:
+    if file_size > TUS_PARALLEL_THRESHOLD:
+        _upload_file_resumable_parallel(bucket, object_path, str(source), content_type, upsert=upsert)
+    elif file_size >= 45 * 1024 * 1024:
         _upload_file_resumable(bucket, object_path, str(source), content_type, upsert=upsert)
     else:
-        with source.open("rb") as fh:
-            payload = fh.read()
         try:
-            _request(
-                "POST",
-                f"/storage/v1/object/{bucket}/{quote(object_path)}",
-                data=payload,
-                headers={
-                    "Content-Type": content_type,
-                    "x-upsert": "true" if upsert else "false",
-                },
-                ok_codes=(200,),
-            )
+            # Stream the file handle; an explicit Content-Length avoids chunked transfer encoding.
+            with source.open("rb") as fh:
+                _request(
+                    "POST",
+                    f"/storage/v1/object/{bucket}/{quote(object_path)}",
+                    data=fh,
+                    headers={
+                        "Content-Type": content_type,
+                        "Content-Length": str(file_size),
+                        "x-upsert": "true" if upsert else "false",
+                    },
+                    ok_codes=(200,),
+                )
         except RuntimeError as exc:
             message = str(exc).lower()
             if "payload too large" in message or '"statuscode":"413"' in message:
@@ -149,6 +297,36 @@ def upload_file(bucket: str, object_path: str, local_path: str, upsert: bool = T
     return make_storage_uri(bucket, object_path)
 
 
+def _tus_uploader(client: tus_client.TusClient, **uploader_kwargs: Any) -> Any:
+    # Prevent large payload during create call, which may trigger HTTP 413.
+    try:
+        return client.uploader(upload_data_during_creation=False, **uploader_kwargs)
+    except TypeError:
+        return client.uploader(**uploader_kwargs)
+
+
+def _tus_upload(client: tus_client.TusClient, **uploader_kwargs: Any) -> Any:
+    uploader = _tus_uploader(client, chunk_size=TUS_CHUNK_SIZE, **uploader_kwargs)
+    try:
+        uploader.upload()
+    except TusCommunicationError as exc:
+        if exc.status_code != 413 or TUS_CHUNK_SIZE <= TUS_FALLBACK_CHUNK_SIZE:
+            raise
+        # Not a resume: this starts a new upload from byte 0 and abandons the partial one.
+        uploader = _tus_uploader(client, chunk_size=TUS_FALLBACK_CHUNK_SIZE, **uploader_kwargs)
+        uploader.upload()
+    return uploader
+
+
+def _tus_metadata(bucket: str, object_path: str, content_type: str) -> dict[str, str]:
+    return {
+        "bucketName": bucket,
+        "objectName": object_path,
+        "contentType": content_type,
+        "cacheControl": "3600",
+    }
+
+
 def _upload_file_resumable(
     bucket: str,
     object_path: str,
@@ -160,22 +338,122 @@ def _upload_file_resumable(
     endpoint = f"{SUPABASE_URL}/storage/v1/upload/resumable"
     headers = _api_headers({"x-upsert": "true" if upsert else "false"})
     client = tus_client.TusClient(endpoint, headers=headers)
-    uploader_kwargs = {
-        "file_path": local_path,
-        "chunk_size": 2 * 1024 * 1024,
-        "metadata": {
-            "bucketName": bucket,
-            "objectName": object_path,
-            "contentType": content_type,
-            "cacheControl": "3600",
+    _tus_upload(
+        client,
+        file_path=local_path,
+        metadata=_tus_metadata(bucket, object_path, content_type),
+    )
+
+
+class _FileRange:
+    """Seekable read-only view over ``length`` bytes of ``fh`` starting at ``start``."""
+
+    def __init__(self, fh: Any, start: int, length: int) -> None:
+        self._fh = fh
+        self._start = start
+        self._length = length
+        self._pos = 0
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._length
+        self._pos = min(max(offset, 0), self._length)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._length - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        self._fh.seek(self._start + self._pos)
+        data = self._fh.read(size)
+        self._pos += len(data)
+        return data
+
+
+def _tus_supports_concatenation(endpoint: str, headers: dict[str, str]) -> bool:
+    try:
+        response = _SESSION.options(endpoint, headers=headers, timeout=30)
+    except requests.RequestException:
+        return False
+    extensions = response.headers.get("Tus-Extension", "")
+    return "concatenation" in {item.strip() for item in extensions.split(",")}
+
+
+def _encode_tus_metadata(metadata: dict[str, str]) -> str:
+    return ",".join(
+        f"{key} {base64.b64encode(value.encode('utf-8')).decode('ascii')}"
+        for key, value in metadata.items()
+    )
+
+
+def _upload_file_resumable_parallel(
+    bucket: str,
+    object_path: str,
+    local_path: str,
+    content_type: str,
+    *,
+    upsert: bool = True,
+    parallel: int = 4,
+) -> None:
+    """Upload ``local_path`` as ``parallel`` concurrent tus partial uploads, then concatenate.
+
+    Falls back to the sequential uploader when the server does not advertise the
+    tus concatenation extension.
+    """
+    endpoint = f"{SUPABASE_URL}/storage/v1/upload/resumable"
+    headers = _api_headers({"x-upsert": "true" if upsert else "false"})
+    if parallel < 2 or not _tus_supports_concatenation(endpoint, headers):
+        _upload_file_resumable(bucket, object_path, local_path, content_type, upsert=upsert)
+        return
+
+    file_size = os.stat(local_path).st_size
+    part_size = -(-file_size // parallel)
+    ranges = [(start, min(part_size, file_size - start)) for start in range(0, file_size, part_size)]
+    part_paths = [f"{object_path}.part{index}" for index in range(len(ranges))]
+
+    def upload_part(index: int) -> str:
+        start, length = ranges[index]
+        client = tus_client.TusClient(endpoint, headers={**headers, "Upload-Concat": "partial"})
+        with open(local_path, "rb") as fh:
+            uploader = _tus_upload(
+                client,
+                file_stream=_FileRange(fh, start, length),
+                metadata=_tus_metadata(bucket, part_paths[index], content_type),
+            )
+        return uploader.url
+
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        part_urls = list(executor.map(upload_part, range(len(ranges))))
+
+    response = _SESSION.post(
+        endpoint,
+        headers={
+            **headers,
+            "Tus-Resumable": "1.0.0",
+            "Upload-Concat": "final;" + " ".join(part_urls),
+            "Upload-Metadata": _encode_tus_metadata(_tus_metadata(bucket, object_path, content_type)),
         },
-    }
-    # Prevent large payload during create call, which may trigger HTTP 413.
+        timeout=120,
+    )
+    if response.status_code not in (200, 201, 204):
+        raise RuntimeError(
+            f"Supabase tus concatenation failed: {object_path} [{response.status_code}] {response.text}"
+        )
     try:
-        uploader = client.uploader(upload_data_during_creation=False, **uploader_kwargs)
-    except TypeError:
-        uploader = client.uploader(**uploader_kwargs)
-    uploader.upload()
+        _request(
+            "DELETE",
+            f"/storage/v1/object/{bucket}",
+            json_body={"prefixes": part_paths},
+            ok_codes=(200,),
+        )
+    except RuntimeError:
+        # Leftover partial objects are harmless; don't fail the upload over cleanup.
+        pass
 
 
 def upload_text(bucket: str, object_path: str, content: str, upsert: bool = True) -> str:
@@ -192,7 +470,7 @@ def upload_text(bucket: str, object_path: str, content: str, upsert: bool = True
 
 def download_text(bucket: str, object_path: str) -> str:
     url = f"{SUPABASE_URL}/storage/v1/object/{bucket}/{quote(object_path)}"
-    response = requests.get(url, headers=_api_headers(), timeout=120)
+    response = _SESSION.get(url, timeout=120)
     if response.status_code == 404:
         raise FileNotFoundError(object_path)
     if response.status_code != 200:
@@ -200,7 +478,24 @@ def download_text(bucket: str, object_path: str) -> str:
     return response.text
 
 
+def _cached_signed_url(uri: str, expires_in: int, now: float) -> str | None:
+    with _SIGNED_URL_CACHE_LOCK:
+        cached = _SIGNED_URL_CACHE.get((uri, expires_in))
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    return None
+
+
+def _remember_signed_url(uri: str, expires_in: int, now: float, url: str) -> None:
+    with _SIGNED_URL_CACHE_LOCK:
+        _SIGNED_URL_CACHE[(uri, expires_in)] = (now + expires_in - expires_in // 2, url)
+
+
 def create_signed_url(uri: str, expires_in: int = 3600) -> str:
+    now = time.time()
+    cached = _cached_signed_url(uri, expires_in, now)
+    if cached is not None:
+        return cached
     bucket, object_path = parse_storage_uri(uri)
     payload = _request(
         "POST",
@@ -208,12 +503,102 @@ def create_signed_url(uri: str, expires_in: int = 3600) -> str:
         json_body={"expiresIn": expires_in},
         ok_codes=(200,),
     )
-    signed = payload.get("signedURL", "")
+    url = _absolute_signed_url(payload.get("signedURL", ""))
+    _remember_signed_url(uri, expires_in, now, url)
+    return url
+
+
+async def acreate_signed_url(uri: str, expires_in: int = 3600, *, use_cache: bool = True) -> str:
+    now = time.time()
+    cached = _cached_signed_url(uri, expires_in, now) if use_cache else None
+    if cached is not None:
+        return cached
+    bucket, object_path = parse_storage_uri(uri)
+    payload = await _arequest(
+        "POST",
+        f"/storage/v1/object/sign/{bucket}/{quote(object_path)}",
+        json_body={"expiresIn": expires_in},
+        ok_codes=(200,),
+    )
+    url = _absolute_signed_url(payload.get("signedURL", ""))
+    if use_cache:
+        _remember_signed_url(uri, expires_in, now, url)
+    return url
+
+
+def _absolute_signed_url(signed: str) -> str:
     if signed.startswith("http://") or signed.startswith("https://"):
         return signed
     return f"{SUPABASE_URL}/storage/v1{signed}"
 
 
+def _split_cached_paths(
+    bucket: str,
+    object_paths: list[str],
+    expires_in: int,
+    now: float,
+) -> tuple[dict[str, str], list[str]]:
+    out: dict[str, str] = {}
+    missing: list[str] = []
+    for object_path in dict.fromkeys(object_paths):
+        cached = _cached_signed_url(make_storage_uri(bucket, object_path), expires_in, now)
+        if cached is not None:
+            out[object_path] = cached
+        else:
+            missing.append(object_path)
+    return out, missing
+
+
+def _collect_batch_signed(
+    bucket: str,
+    payload: list[dict[str, Any]] | None,
+    expires_in: int,
+    now: float,
+    out: dict[str, str],
+) -> dict[str, str]:
+    for item in payload or []:
+        signed = item.get("signedURL")
+        object_path = item.get("path")
+        if not signed or not object_path or item.get("error"):
+            continue
+        url = _absolute_signed_url(signed)
+        out[object_path] = url
+        _remember_signed_url(make_storage_uri(bucket, object_path), expires_in, now, url)
+    return out
+
+
+def batch_sign(bucket: str, object_paths: list[str], expires_in: int = 3600) -> dict[str, str]:
+    """Sign many objects in one bucket with a single storage request.
+
+    Returns ``{object_path: signed_url}``; objects that could not be signed are omitted.
+    """
+    now = time.time()
+    out, missing = _split_cached_paths(bucket, object_paths, expires_in, now)
+    if not missing:
+        return out
+    payload = _request(
+        "POST",
+        f"/storage/v1/object/sign/{bucket}",
+        json_body={"expiresIn": expires_in, "paths": missing},
+        ok_codes=(200,),
+    )
+    return _collect_batch_signed(bucket, payload, expires_in, now, out)
+
+
+async def abatch_sign(bucket: str, object_paths: list[str], expires_in: int = 3600) -> dict[str, str]:
+    now = time.time()
+    out, missing = _split_cached_paths(bucket, object_paths, expires_in, now)
+    if not missing:
+        return out
+    payload = await _arequest(
+        "POST",
+        f"/storage/v1/object/sign/{bucket}",
+        json_body={"expiresIn": expires_in, "paths": missing},
+        ok_codes=(200,),
+    )
+    return _collect_batch_signed(bucket, payload, expires_in, now, out)
+
+
 def clip_thumbnail_uri_from_clip_uri(clip_uri: str) -> str:
     bucket, object_path = parse_storage_uri(clip_uri)
     if bucket != "clips":
@@ -222,15 +607,13 @@ def clip_thumbnail_uri_from_clip_uri(clip_uri: str) -> str:
     return make_storage_uri("thumbnails", f"{base}.jpg")
 
 
-def table_select(
-    table: str,
-    *,
-    columns: str = "*",
-    filters: dict[str, str] | None = None,
-    order: str | None = None,
-    limit: int | None = None,
-    offset: int | None = None,
-) -> list[dict[str, Any]]:
+def _select_params(
+    columns: str,
+    filters: dict[str, str] | None,
+    order: str | None,
+    limit: int | None,
+    offset: int | None,
+) -> dict[str, Any]:
     params: dict[str, Any] = {"select": columns}
     if filters:
         params.update(filters)
@@ -240,9 +623,35 @@ def table_select(
         params["limit"] = str(limit)
     if offset is not None:
         params["offset"] = str(offset)
+    return params
+
+
+def table_select(
+    table: str,
+    *,
+    columns: str = "*",
+    filters: dict[str, str] | None = None,
+    order: str | None = None,
+    limit: int | None = None,
+    offset: int | None = None,
+) -> list[dict[str, Any]]:
+    params = _select_params(columns, filters, order, limit, offset)
     return _request("GET", f"/rest/v1/{table}", params=params, ok_codes=(200,))
 
 
+async def atable_select(
+    table: str,
+    *,
+    columns: str = "*",
+    filters: dict[str, str] | None = None,
+    order: str | None = None,
+    limit: int | None = None,
+    offset: int | None = None,
+) -> list[dict[str, Any]]:
+    params = _select_params(columns, filters, order, limit, offset)
+    return await _arequest("GET", f"/rest/v1/{table}", params=params, ok_codes=(200,))
+
+
 def table_insert(table: str, payload: dict[str, Any] | list[dict[str, Any]]) -> list[dict[str, Any]]:
     return _request(
         "POST",
@@ -293,6 +702,15 @@ def table_delete(table: str, *, filters: dict[str, str]) -> None:
     )
 
 
+def rpc(name: str, payload: dict[str, Any]) -> Any:
+    return _request(
+        "POST",
+        f"/rest/v1/rpc/{name}",
+        json_body=payload,
+        ok_codes=(200,),
+    )
+
+
 def _eq_filters(**kwargs: Any) -> dict[str, str]:
     return {k: f"eq.{v}" for k, v in kwargs.items()}
 
@@ -385,9 +803,33 @@ def upsert_tag(facet: str, name: str, *, is_allowed: int = 0) -> int:
         },
         on_conflict="facet,name",
     )[0]
+    _invalidate_tags_cache()
     return int(row["id"])
 
 
+def _upsert_tag_set(
+    *,
+    main_tags: list[str],
+    sub_tags: list[str],
+    video_tags: list[str] | None = None,
+) -> list[int]:
+    """Upsert all facet tags in one request and return their ids."""
+    payload: list[dict[str, Any]] = []
+    for facet, names, is_allowed in (
+        ("main", main_tags, 1),
+        ("video", video_tags or [], 1),
+        ("sub", sub_tags, 0),
+    ):
+        for tag in sorted({_normalize_tag(t) for t in names if t.strip()}):
+            payload.append({"facet": facet, "name": tag, "is_allowed": is_allowed})
+    if not payload:
+        return []
+    rows = table_upsert("tags", payload, on_conflict="facet,name")
+    _invalidate_tags_cache()
+    id_by_key = {(row["facet"], row["name"]): int(row["id"]) for row in rows}
+    return [id_by_key[(item["facet"], item["name"])] for item in payload]
+
+
 def replace_clip_tags(
     clip_id: int,
     *,
@@ -396,16 +838,8 @@ def replace_clip_tags(
     video_tags: list[str] | None = None,
 ) -> None:
     table_delete("clip_tags", filters=_eq_filters(clip_id=clip_id))
-    links: list[dict[str, Any]] = []
-    for tag in sorted({_normalize_tag(t) for t in main_tags if t.strip()}):
-        tag_id = upsert_tag("main", tag, is_allowed=1)
-        links.append({"clip_id": clip_id, "tag_id": tag_id})
-    for tag in sorted({_normalize_tag(t) for t in (video_tags or []) if t.strip()}):
-        tag_id = upsert_tag("video", tag, is_allowed=1)
-        links.append({"clip_id": clip_id, "tag_id": tag_id})
-    for tag in sorted({_normalize_tag(t) for t in sub_tags if t.strip()}):
-        tag_id = upsert_tag("sub", tag, is_allowed=0)
-        links.append({"clip_id": clip_id, "tag_id": tag_id})
+    tag_ids = _upsert_tag_set(main_tags=main_tags, sub_tags=sub_tags, video_tags=video_tags)
+    links = [{"clip_id": clip_id, "tag_id": tag_id} for tag_id in tag_ids]
     if links:
         table_upsert("clip_tags", links, on_conflict="clip_id,tag_id")
 
@@ -418,16 +852,8 @@ def replace_video_tags(
     video_tags: list[str] | None = None,
 ) -> None:
     table_delete("video_tags", filters=_eq_filters(video_id=video_id))
-    links: list[dict[str, Any]] = []
-    for tag in sorted({_normalize_tag(t) for t in main_tags if t.strip()}):
-        tag_id = upsert_tag("main", tag, is_allowed=1)
-        links.append({"video_id": video_id, "tag_id": tag_id})
-    for tag in sorted({_normalize_tag(t) for t in (video_tags or []) if t.strip()}):
-        tag_id = upsert_tag("video", tag, is_allowed=1)
-        links.append({"video_id": video_id, "tag_id": tag_id})
-    for tag in sorted({_normalize_tag(t) for t in sub_tags if t.strip()}):
-        tag_id = upsert_tag("sub", tag, is_allowed=0)
-        links.append({"video_id": video_id, "tag_id": tag_id})
+    tag_ids = _upsert_tag_set(main_tags=main_tags, sub_tags=sub_tags, video_tags=video_tags)
+    links = [{"video_id": video_id, "tag_id": tag_id} for tag_id in tag_ids]
     if links:
         table_upsert("video_tags", links, on_conflict="video_id,tag_id")
 
@@ -438,34 +864,62 @@ def set_clip_favorite(clip_id: int, is_favorite: bool) -> None:
 
 def list_tags(facet: str | None = None) -> list[dict[str, Any]]:
     filters = _eq_filters(facet=facet) if facet else None
-    return table_select("tags", filters=filters, order="facet.asc,name.asc")
+    tags = _cached(
+        ("list_tags", facet),
+        lambda: table_select("tags", filters=filters, order="facet.asc,name.asc"),
+    )
+    return [dict(tag) for tag in tags]
+
+
+def _sort_tags(tags: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    tags.sort(key=lambda t: (t.get("facet", ""), t.get("name", "")))
+    return tags
+
+
+def _embedded_tags(links: list[dict[str, Any]] | None) -> list[dict[str, Any]]:
+    return _sort_tags([link["tags"] for link in links or [] if link.get("tags")])
+
+
+def _flatten_clip_row(clip: dict[str, Any]) -> dict[str, Any]:
+    row = dict(clip)
+    video = row.pop("videos", None) or {}
+    row["video_title"] = video.get("title")
+    if "clip_tags" in row:
+        row["tags"] = _embedded_tags(row.pop("clip_tags"))
+    return row
+
+
+# Explicit column lists keep list payloads stable if wide columns are added later.
+_CLIP_COLUMNS = (
+    "id,video_id,file_path,start_sec,end_sec,duration_sec,type,title,description,is_favorite,created_at"
+)
+_VIDEO_COLUMNS = "id,title,description,file_path,created_at"
+_VIDEO_LIST_COLUMNS = f"{_VIDEO_COLUMNS},video_tags(tags(id,facet,name)),clips(id)"
+
+
+def _flatten_video_row(video: dict[str, Any]) -> dict[str, Any]:
+    row = dict(video)
+    row["clip_count"] = len(row.pop("clips", None) or [])
+    row["tags"] = _embedded_tags(row.pop("video_tags", None))
+    return row
 
 
 def list_videos() -> list[dict[str, Any]]:
-    videos = table_select("videos", order="created_at.desc,id.desc")
-    clips = table_select("clips", columns="id,video_id")
-    count_by_video: dict[int, int] = {}
-    for clip in clips:
-        vid = int(clip["video_id"])
-        count_by_video[vid] = count_by_video.get(vid, 0) + 1
-    out: list[dict[str, Any]] = []
-    for video in videos:
-        row = dict(video)
-        row["clip_count"] = count_by_video.get(int(video["id"]), 0)
-        out.append(row)
-    return out
+    videos = table_select("videos", columns=_VIDEO_LIST_COLUMNS, order="created_at.desc,id.desc")
+    return [_flatten_video_row(video) for video in videos]
+
+
+async def alist_videos() -> list[dict[str, Any]]:
+    videos = await atable_select("videos", columns=_VIDEO_LIST_COLUMNS, order="created_at.desc,id.desc")
+    return [_flatten_video_row(video) for video in videos]
 
 
 def query_clips() -> list[dict[str, Any]]:
-    clips = table_select("clips", order="id.asc")
-    videos = table_select("videos", columns="id,title")
-    titles = {int(v["id"]): v.get("title") for v in videos}
-    out: list[dict[str, Any]] = []
-    for clip in clips:
-        row = dict(clip)
-        row["video_title"] = titles.get(int(clip["video_id"]))
-        out.append(row)
-    return out
+    clips = table_select("clips", columns=f"{_CLIP_COLUMNS},videos(title)", order="id.asc")
+    return [_flatten_clip_row(clip) for clip in clips]
+
+
+_CLIP_PAGE_COLUMNS = f"{_CLIP_COLUMNS},videos(title),clip_tags(tags(id,facet,name))"
 
 
 def query_clips_paginated(
@@ -477,35 +931,55 @@ def query_clips_paginated(
     filters = {"is_favorite": "eq.true"} if favorites_only else None
     rows = table_select(
         "clips",
+        columns=_CLIP_PAGE_COLUMNS,
         filters=filters,
         order="id.asc",
         limit=limit + 1,
         offset=offset,
     )
     has_more = len(rows) > limit
-    page_rows = rows[:limit]
-
-    video_ids = sorted({int(r["video_id"]) for r in page_rows})
-    video_title_by_id: dict[int, str | None] = {}
-    if video_ids:
-        videos = table_select(
-            "videos",
-            columns="id,title",
-            filters={"id": _in_filter(video_ids)},
-        )
-        video_title_by_id = {int(v["id"]): v.get("title") for v in videos}
+    return [_flatten_clip_row(clip) for clip in rows[:limit]], has_more
 
-    out: list[dict[str, Any]] = []
-    for clip in page_rows:
-        row = dict(clip)
-        row["video_title"] = video_title_by_id.get(int(clip["video_id"]))
-        out.append(row)
-    return out, has_more
+
+async def aquery_clips_paginated(
+    *,
+    limit: int,
+    offset: int,
+    favorites_only: bool = False,
+) -> tuple[list[dict[str, Any]], bool]:
+    filters = {"is_favorite": "eq.true"} if favorites_only else None
+    rows = await atable_select(
+        "clips",
+        columns=_CLIP_PAGE_COLUMNS,
+        filters=filters,
+        order="id.asc",
+        limit=limit + 1,
+        offset=offset,
+    )
+    has_more = len(rows) > limit
+    return [_flatten_clip_row(clip) for clip in rows[:limit]], has_more
 
 
 def get_tags_for_clips(clip_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+    # Kept for ingest/external callers only; the API routes read embedded clip_tags instead.
     if not clip_ids:
         return {}
+    try:
+        rows = rpc("get_tags_for_clips", {"clip_ids": clip_ids})
+    except RuntimeError as exc:
+        # PGRST202: the function from schema.sql has not been applied to this database yet.
+        if "PGRST202" not in str(exc):
+            raise
+        return _get_tags_for_clips_by_links(clip_ids)
+    tags_by_clip: dict[int, list[dict[str, Any]]] = {clip_id: [] for clip_id in clip_ids}
+    for row in rows or []:
+        tags_by_clip.setdefault(int(row["clip_id"]), []).append(
+            {"id": row["id"], "facet": row["facet"], "name": row["name"]}
+        )
+    return tags_by_clip
+
+
+def _get_tags_for_clips_by_links(clip_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
     links = table_select(
         "clip_tags",
         columns="clip_id,tag_id",
@@ -515,34 +989,28 @@ def get_tags_for_clips(clip_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
         return {clip_id: [] for clip_id in clip_ids}
 
     tag_ids = sorted({int(link["tag_id"]) for link in links})
-    tags_by_id: dict[int, dict[str, Any]] = {}
-    if tag_ids:
-        tags = table_select("tags", columns="id,facet,name", filters={"id": _in_filter(tag_ids)})
-        tags_by_id = {int(tag["id"]): tag for tag in tags}
+    tags = table_select("tags", columns="id,facet,name", filters={"id": _in_filter(tag_ids)})
+    tags_by_id = {int(tag["id"]): tag for tag in tags}
 
     tags_by_clip: dict[int, list[dict[str, Any]]] = {clip_id: [] for clip_id in clip_ids}
     for link in links:
-        clip_id = int(link["clip_id"])
-        tag_id = int(link["tag_id"])
-        tag = tags_by_id.get(tag_id)
+        tag = tags_by_id.get(int(link["tag_id"]))
         if tag is not None:
-            tags_by_clip.setdefault(clip_id, []).append(tag)
+            tags_by_clip.setdefault(int(link["clip_id"]), []).append(tag)
 
     for tag_list in tags_by_clip.values():
-        tag_list.sort(key=lambda t: (t.get("facet", ""), t.get("name", "")))
+        _sort_tags(tag_list)
     return tags_by_clip
 
 
 def list_favorite_clips() -> list[dict[str, Any]]:
-    clips = table_select("clips", filters={"is_favorite": "eq.true"}, order="created_at.desc,id.desc")
-    videos = table_select("videos", columns="id,title")
-    titles = {int(v["id"]): v.get("title") for v in videos}
-    out: list[dict[str, Any]] = []
-    for clip in clips:
-        row = dict(clip)
-        row["video_title"] = titles.get(int(clip["video_id"]))
-        out.append(row)
-    return out
+    clips = table_select(
+        "clips",
+        columns=f"{_CLIP_COLUMNS},videos(title)",
+        filters={"is_favorite": "eq.true"},
+        order="created_at.desc,id.desc",
+    )
+    return [_flatten_clip_row(clip) for clip in clips]
 
 
 def get_clip(clip_id: int) -> dict[str, Any] | None:
@@ -559,14 +1027,27 @@ def get_video(video_id: int) -> dict[str, Any] | None:
     return rows[0]
 
 
+async def aget_clip(clip_id: int) -> dict[str, Any] | None:
+    rows = await atable_select("clips", filters=_eq_filters(id=clip_id), limit=1)
+    if not rows:
+        return None
+    return rows[0]
+
+
+async def aget_video(video_id: int) -> dict[str, Any] | None:
+    rows = await atable_select("videos", filters=_eq_filters(id=video_id), limit=1)
+    if not rows:
+        return None
+    return rows[0]
+
+
 def get_tags_for_clip(clip_id: int) -> list[dict[str, Any]]:
     links = table_select("clip_tags", filters=_eq_filters(clip_id=clip_id))
     if not links:
         return []
     tag_ids = [int(l["tag_id"]) for l in links]
     tags = table_select("tags", filters={"id": _in_filter(tag_ids)})
-    tags.sort(key=lambda t: (t.get("facet", ""), t.get("name", "")))
-    return tags
+    return _sort_tags(tags)
 
 
 def get_tags_for_video(video_id: int) -> list[dict[str, Any]]:
@@ -575,8 +1056,7 @@ def get_tags_for_video(video_id: int) -> list[dict[str, Any]]:
         return []
     tag_ids = [int(l["tag_id"]) for l in links]
     tags = table_select("tags", filters={"id": _in_filter(tag_ids)})
-    tags.sort(key=lambda t: (t.get("facet", ""), t.get("name", "")))
-    return tags
+    return _sort_tags(tags)
 
 
 def prune_missing_media() -> dict[str, int]:
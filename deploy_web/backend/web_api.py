@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
-from pathlib import Path
 from typing import Any
 
+import httpx
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
@@ -14,6 +17,9 @@ from fastapi.responses import RedirectResponse
 import supabase_store as store
 
 
+logger = logging.getLogger(__name__)
+
+
 def _cors_origins() -> list[str]:
     raw = os.getenv("CORS_ORIGINS", "")
     if raw.strip():
@@ -64,23 +70,54 @@ def _safe_datetime(value: str | None) -> str:
     return value
 
 
-def _clip_row_to_ui(clip: dict[str, Any], tags: list[dict[str, Any]]) -> dict[str, Any]:
-    main_tags = sorted({t["name"] for t in tags if t["facet"] == "main"})
-    video_tags = sorted({t["name"] for t in tags if t["facet"] == "video"})
-    sub_tags = sorted({t["name"] for t in tags if t["facet"] == "sub"})
-    all_tags = sorted(set(main_tags + video_tags + sub_tags))
+def _tag_names_by_facet(tags: list[dict[str, Any]]) -> dict[str, set[str]]:
+    names: dict[str, set[str]] = {"main": set(), "video": set(), "sub": set()}
+    for tag in tags:
+        bucket = names.get(tag["facet"])
+        if bucket is not None:
+            bucket.add(tag["name"])
+    return names
 
-    clip_path = Path(str(clip["file_path"]))
-    source_video = clip.get("video_title") or "Unknown video"
-    title = clip.get("title") or clip_path.stem
 
-    thumbnail_url: str | None = None
+async def _thumbnail_urls(rows: list[dict[str, Any]]) -> dict[str, str]:
+    """Sign every thumbnail on a page with one storage request, keyed by clip file path."""
+    thumb_path_by_clip: dict[str, str] = {}
+    for row in rows:
+        file_path = str(row["file_path"])
+        if file_path.startswith("supabase://clips/"):
+            thumb_uri = store.clip_thumbnail_uri_from_clip_uri(file_path)
+            thumb_path_by_clip[file_path] = store.parse_storage_uri(thumb_uri)[1]
+    if not thumb_path_by_clip:
+        return {}
     try:
-        if str(clip["file_path"]).startswith("supabase://clips/"):
-            thumb_uri = store.clip_thumbnail_uri_from_clip_uri(str(clip["file_path"]))
-            thumbnail_url = store.create_signed_url(thumb_uri)
-    except Exception:
-        thumbnail_url = None
+        signed = await store.abatch_sign("thumbnails", list(thumb_path_by_clip.values()))
+    except (RuntimeError, httpx.HTTPError):
+        # Thumbnails are best-effort; a signing or transport failure must not fail the page.
+        logger.warning("Batch thumbnail signing failed; returning clips without thumbnails", exc_info=True)
+        return {}
+    return {
+        file_path: signed[thumb_path]
+        for file_path, thumb_path in thumb_path_by_clip.items()
+        if thumb_path in signed
+    }
+
+
+def _clip_row_to_ui(
+    clip: dict[str, Any],
+    tags: list[dict[str, Any]],
+    thumbnail_urls: dict[str, str],
+) -> dict[str, Any]:
+    names = _tag_names_by_facet(tags)
+    main_tags = sorted(names["main"])
+    video_tags = sorted(names["video"])
+    sub_tags = sorted(names["sub"])
+    all_tags = sorted(names["main"] | names["video"] | names["sub"])
+
+    file_path = clip["file_path"]
+    file_path_str = file_path if isinstance(file_path, str) else str(file_path)
+    source_video = clip.get("video_title") or "Unknown video"
+    title = clip.get("title") or file_path_str.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    thumbnail_url = thumbnail_urls.get(file_path_str)
 
     return {
         "id": str(clip["id"]),
@@ -99,15 +136,16 @@ def _clip_row_to_ui(clip: dict[str, Any], tags: list[dict[str, Any]]) -> dict[st
         "summary": clip.get("description") or "No summary available.",
         "isFavorite": bool(clip.get("is_favorite", 0)),
         "createdAt": _safe_datetime(clip.get("created_at")),
-        "filePath": clip["file_path"],
+        "filePath": file_path,
         "videoId": str(clip["video_id"]),
         "thumbnailUrl": thumbnail_url,
     }
 
 
 def _video_row_to_ui(video: dict[str, Any], tags: list[dict[str, Any]]) -> dict[str, Any]:
-    main_tags = sorted({t["name"] for t in tags if t["facet"] == "main"})
-    sub_tags = sorted({t["name"] for t in tags if t["facet"] == "sub"})
+    names = _tag_names_by_facet(tags)
+    main_tags = sorted(names["main"])
+    sub_tags = sorted(names["sub"])
     return {
         "id": str(video["id"]),
         "title": video.get("title") or "Untitled video",
@@ -120,7 +158,13 @@ def _video_row_to_ui(video: dict[str, Any], tags: list[dict[str, Any]]) -> dict[
     }
 
 
-app = FastAPI(title="BJJ Clip Library API")
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    yield
+    await store.aclose()
+
+
+app = FastAPI(title="BJJ Clip Library API", lifespan=_lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_cors_origins(),
@@ -153,17 +197,20 @@ def library_meta(
 
 
 @app.get("/api/library/clips")
-def library_clips(
+async def library_clips(
     limit: int = Query(default=36, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
     db_path: str = Query(default="", description="Unused legacy DB path"),
 ) -> dict[str, Any]:
     _prepare_db(db_path)
-    rows, has_more = store.query_clips_paginated(limit=limit, offset=offset, favorites_only=False)
-    clip_ids = [int(row["id"]) for row in rows]
-    tags_by_clip_id = store.get_tags_for_clips(clip_ids)
+    rows, has_more = await store.aquery_clips_paginated(
+        limit=limit,
+        offset=offset,
+        favorites_only=False,
+    )
+    thumbnail_urls = await _thumbnail_urls(rows)
     clips: list[dict[str, Any]] = [
-        _clip_row_to_ui(row, tags_by_clip_id.get(int(row["id"]), []))
+        _clip_row_to_ui(row, row.get("tags", []), thumbnail_urls)
         for row in rows
     ]
     return {
@@ -176,17 +223,20 @@ def library_clips(
 
 
 @app.get("/api/library/favorites")
-def library_favorites(
+async def library_favorites(
     limit: int = Query(default=36, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
     db_path: str = Query(default="", description="Unused legacy DB path"),
 ) -> dict[str, Any]:
     _prepare_db(db_path)
-    rows, has_more = store.query_clips_paginated(limit=limit, offset=offset, favorites_only=True)
-    clip_ids = [int(row["id"]) for row in rows]
-    tags_by_clip_id = store.get_tags_for_clips(clip_ids)
+    rows, has_more = await store.aquery_clips_paginated(
+        limit=limit,
+        offset=offset,
+        favorites_only=True,
+    )
+    thumbnail_urls = await _thumbnail_urls(rows)
     clips: list[dict[str, Any]] = [
-        _clip_row_to_ui(row, tags_by_clip_id.get(int(row["id"]), []))
+        _clip_row_to_ui(row, row.get("tags", []), thumbnail_urls)
         for row in rows
     ]
     return {
@@ -210,43 +260,42 @@ def set_favorite(
 
 
 @app.get("/api/library/videos")
-def library_videos(
+async def library_videos(
     db_path: str = Query(default="", description="Unused legacy DB path"),
 ) -> dict[str, Any]:
     _prepare_db(db_path)
-    rows = store.list_videos()
-    videos: list[dict[str, Any]] = []
-    for row in rows:
-        tags = store.get_tags_for_video(int(row["id"]))
-        videos.append(_video_row_to_ui(row, tags))
+    rows = await store.alist_videos()
+    videos: list[dict[str, Any]] = [_video_row_to_ui(row, row["tags"]) for row in rows]
     return {"videos": videos}
 
 
 @app.get("/api/clips/{clip_id}/stream")
-def stream_clip(
+async def stream_clip(
     clip_id: int,
     db_path: str = Query(default="", description="Unused legacy DB path"),
 ) -> RedirectResponse:
     _prepare_db(db_path)
-    row = store.get_clip(clip_id)
+    row = await store.aget_clip(clip_id)
     if row is None:
         raise HTTPException(status_code=404, detail="Clip not found")
     uri = row["file_path"]
     if not str(uri).startswith("supabase://"):
         raise HTTPException(status_code=404, detail="Clip is not in Supabase storage")
-    return RedirectResponse(url=store.create_signed_url(uri))
+    # Players keep issuing range requests against this URL, so always sign a fresh one.
+    return RedirectResponse(url=await store.acreate_signed_url(uri, use_cache=False))
 
 
 @app.get("/api/videos/{video_id}/stream")
-def stream_video(
+async def stream_video(
     video_id: int,
     db_path: str = Query(default="", description="Unused legacy DB path"),
 ) -> RedirectResponse:
     _prepare_db(db_path)
-    row = store.get_video(video_id)
+    row = await store.aget_video(video_id)
     if row is None:
         raise HTTPException(status_code=404, detail="Video not found")
     uri = row["file_path"]
     if not str(uri).startswith("supabase://"):
         raise HTTPException(status_code=404, detail="Video is not in Supabase storage")
-    return RedirectResponse(url=store.create_signed_url(uri))
+    # Players keep issuing range requests against this URL, so always sign a fresh one.
+    return RedirectResponse(url=await store.acreate_signed_url(uri, use_cache=False))